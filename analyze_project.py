@@ -5,30 +5,314 @@ Utility script to analyze the Multilingua project structure and generate documen
 import os
 import sys
 import json
+import base64
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 import re
 
-def count_files_by_extension(directory):
+class FileIndex:
+    """Compact columnar index of the files below a project directory.
+
+    Every file gets an integer id.  Paths are split into an interned
+    directory table and a file name stored in one packed buffer, while
+    extensions, sizes and modification times live in typed arrays, so the
+    per-file cost stays flat no matter how large the tree is.  Byte totals
+    per extension and per directory are kept up to date as files are added.
+
+    Detector hits are stored per (category, label) pair: as a sorted array
+    of file ids while the label is rare, switching to a bitset over all
+    files once that is smaller.  High-cardinality categories such as API
+    routes therefore cost memory per hit, not per label times files.  Each
+    category also keeps a log of (label id, file id) columns in the order
+    hits were recorded, so findings can be listed in the order a detector
+    reported them within each file.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.dirs = []
+        self._dir_ids = {}
+        self.extensions = []
+        self._ext_ids = {}
+        self._name_data = bytearray()
+        self._name_offsets = array('Q', [0])
+        self.dir_ids = array('I')
+        self.ext_ids = array('I')
+        self.sizes = array('q')
+        self.mtimes = array('d')
+        self.extension_bytes = array('q')
+        self.directory_bytes = array('q')
+        self.hits = {}
+        self._label_ids = {}
+        self.hit_log = {}
+
+    def __len__(self):
+        return len(self._name_offsets) - 1
+
+    def _intern(self, table, ids, value):
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = len(table)
+            value = sys.intern(value)
+            table.append(value)
+            ids[value] = value_id
+        return value_id
+
+    def add_dir(self, rel_dir):
+        """Record a directory, even one without files, and return its id."""
+        dir_id = self._intern(self.dirs, self._dir_ids, rel_dir)
+        if dir_id == len(self.directory_bytes):
+            self.directory_bytes.append(0)
+        return dir_id
+
+    def add(self, rel_dir, name, size=0, mtime=0.0):
+        """Record a file and return its id."""
+        _, ext = os.path.splitext(name)
+        file_id = len(self)
+        dir_id = self.add_dir(rel_dir)
+        ext_id = self._intern(self.extensions, self._ext_ids, ext[1:].lower())
+        if ext_id == len(self.extension_bytes):
+            self.extension_bytes.append(0)
+        self.dir_ids.append(dir_id)
+        self.ext_ids.append(ext_id)
+        self._name_data += name.encode('utf-8', 'surrogateescape')
+        self._name_offsets.append(len(self._name_data))
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.directory_bytes[dir_id] += size
+        self.extension_bytes[ext_id] += size
+        return file_id
+
+    def name(self, file_id):
+        start, end = self._name_offsets[file_id], self._name_offsets[file_id + 1]
+        return self._name_data[start:end].decode('utf-8', 'surrogateescape')
+
+    def relpath(self, file_id):
+        rel_dir = self.dirs[self.dir_ids[file_id]]
+        return os.path.join(rel_dir, self.name(file_id)) if rel_dir else self.name(file_id)
+
+    def path(self, file_id):
+        return os.path.join(self.root, self.relpath(file_id))
+
+    def dir_path(self, file_id):
+        return os.path.join(self.root, self.dirs[self.dir_ids[file_id]])
+
+    def extension(self, file_id):
+        return self.extensions[self.ext_ids[file_id]]
+
+    def files_with_extensions(self, extensions):
+        """Yield the ids of files whose extension (without the dot) is in *extensions*."""
+        wanted = {self._ext_ids[ext] for ext in extensions if ext in self._ext_ids}
+        for file_id, ext_id in enumerate(self.ext_ids):
+            if ext_id in wanted:
+                yield file_id
+
+    def read_text(self, file_id):
+        """Return the contents of a file, or None if it cannot be read."""
+        try:
+            with open(self.path(file_id), 'r') as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def mark(self, category, label, file_id):
+        """Record that the detector *category* found *label* in a file."""
+        if not self._add_hit(category, label, file_id):
+            return
+        label_ids = self._label_ids.setdefault(category, {})
+        label_id = label_ids.setdefault(label, len(label_ids))
+        log = self.hit_log.setdefault(category, (array('I'), array('I')))
+        log[0].append(label_id)
+        log[1].append(file_id)
+
+    def _add_hit(self, category, label, file_id):
+        """Set the hit for *label* in a file; return False if it was already set."""
+        labels = self.hits.setdefault(category, {})
+        hits = labels.get(label)
+        if hits is None:
+            labels[label] = array('I', [file_id])
+            return True
+        if isinstance(hits, array):
+            # Sparse: a sorted array of file ids, usually appended in order
+            if not hits or hits[-1] < file_id:
+                hits.append(file_id)
+            else:
+                position = bisect_left(hits, file_id)
+                if position < len(hits) and hits[position] == file_id:
+                    return False
+                hits.insert(position, file_id)
+            if len(hits) * hits.itemsize > (len(self) + 7) >> 3:
+                # Dense: a bitset over all files is now the smaller representation
+                bits = labels[label] = bytearray((len(self) + 7) >> 3)
+                for hit in hits:
+                    bits[hit >> 3] |= 1 << (hit & 7)
+            return True
+        byte = file_id >> 3
+        if byte >= len(hits):
+            hits.extend(bytes(byte - len(hits) + 1))
+        mask = 1 << (file_id & 7)
+        if hits[byte] & mask:
+            return False
+        hits[byte] |= mask
+        return True
+
+    def hit_files(self, category, label):
+        """Yield the ids of files marked with *label* by *category*, in id order."""
+        hits = self.hits.get(category, {}).get(label)
+        if not hits:
+            return
+        if isinstance(hits, array):
+            yield from hits
+            return
+        for byte_index, byte in enumerate(hits):
+            while byte:
+                low = byte & -byte
+                yield (byte_index << 3) + low.bit_length() - 1
+                byte ^= low
+
+    def findings(self, category):
+        """Yield ``(label, file_id)`` pairs for a detector category, grouped by file.
+
+        Files come in id order (the order they were walked); within a file,
+        hits keep the order in which the detector recorded them for that file.
+        """
+        log = self.hit_log.get(category)
+        if not log:
+            return iter(())
+        labels = list(self.hits[category])
+        label_col, file_col = log
+        # Stable sort: hits of the same file keep their recorded order
+        order = sorted(range(len(file_col)), key=file_col.__getitem__)
+        return ((labels[label_col[i]], file_col[i]) for i in order)
+
+    def labels(self, category):
+        return list(self.hits.get(category, {}))
+
+    def to_dict(self):
+        """Return a JSON-serializable representation of the index."""
+        def pack(column):
+            return base64.b64encode(column.tobytes()).decode('ascii')
+
+        def pack_hits(hits):
+            if isinstance(hits, array):
+                return "ids:" + pack(hits)
+            return "bits:" + base64.b64encode(bytes(hits)).decode('ascii')
+
+        return {
+            "root": self.root,
+            "byteorder": sys.byteorder,
+            "dirs": self.dirs,
+            "extensions": self.extensions,
+            "name_data": base64.b64encode(bytes(self._name_data)).decode('ascii'),
+            "name_offsets": pack(self._name_offsets),
+            "dir_ids": pack(self.dir_ids),
+            "ext_ids": pack(self.ext_ids),
+            "sizes": pack(self.sizes),
+            "mtimes": pack(self.mtimes),
+            "hits": {
+                category: {label: pack_hits(hits) for label, hits in labels.items()}
+                for category, labels in self.hits.items()
+            },
+            "hit_log": {
+                category: {"labels": pack(label_col), "files": pack(file_col)}
+                for category, (label_col, file_col) in self.hit_log.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild an index produced by :meth:`to_dict`."""
+        index = cls(data["root"])
+        index.dirs = [sys.intern(d) for d in data["dirs"]]
+        index._dir_ids = {d: i for i, d in enumerate(index.dirs)}
+        index.extensions = [sys.intern(e) for e in data["extensions"]]
+        index._ext_ids = {e: i for i, e in enumerate(index.extensions)}
+        index._name_data = bytearray(base64.b64decode(data["name_data"]))
+        swap = data.get("byteorder", sys.byteorder) != sys.byteorder
+
+        def unpack(typecode, encoded):
+            values = array(typecode, base64.b64decode(encoded))
+            if swap:
+                values.byteswap()
+            return values
+
+        index._name_offsets = unpack('Q', data["name_offsets"])
+        for column in ("dir_ids", "ext_ids", "sizes", "mtimes"):
+            setattr(index, column, unpack(getattr(index, column).typecode, data[column]))
+
+        def unpack_hits(encoded):
+            kind, _, payload = encoded.partition(":")
+            if kind == "ids":
+                return unpack('I', payload)
+            return bytearray(base64.b64decode(payload))
+
+        index.hits = {
+            category: {label: unpack_hits(hits) for label, hits in labels.items()}
+            for category, labels in data.get("hits", {}).items()
+        }
+        # Label ids in the hit log index the labels of a category in insertion order
+        index._label_ids = {
+            category: {label: i for i, label in enumerate(labels)}
+            for category, labels in index.hits.items()
+        }
+        index.hit_log = {
+            category: (unpack('I', log["labels"]), unpack('I', log["files"]))
+            for category, log in data.get("hit_log", {}).items()
+        }
+        # Byte totals are derived data, so rebuild them instead of storing them
+        index.directory_bytes = array('q', bytes(8 * len(index.dirs)))
+        index.extension_bytes = array('q', bytes(8 * len(index.extensions)))
+        for dir_id, ext_id, size in zip(index.dir_ids, index.ext_ids, index.sizes):
+            index.directory_bytes[dir_id] += size
+            index.extension_bytes[ext_id] += size
+        return index
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+def build_file_index(directory):
+    """Walk the directory once and record every file in a FileIndex."""
+    index = FileIndex(directory)
+    for root, _, files in os.walk(directory):
+        rel_dir = os.path.relpath(root, directory)
+        if rel_dir == os.curdir:
+            rel_dir = ""
+        index.add_dir(rel_dir)
+        for file in files:
+            try:
+                st = os.stat(os.path.join(root, file))
+                size, mtime = st.st_size, st.st_mtime
+            except OSError:
+                size, mtime = 0, 0.0
+            index.add(rel_dir, file, size, mtime)
+    return index
+
+def count_files_by_extension(directory, index=None):
     """Count files by extension in the given directory."""
+    if index is None:
+        index = build_file_index(directory)
     extensions = defaultdict(int)
     
-    for root, _, files in os.walk(directory):
-        for file in files:
-            # Skip hidden files
-            if file.startswith('.'):
-                continue
-                
-            # Get file extension
-            _, ext = os.path.splitext(file)
-            if ext:
-                # Remove the dot from the extension
-                ext = ext[1:].lower()
-                extensions[ext] += 1
+    for file_id, ext_id in enumerate(index.ext_ids):
+        # Skip hidden files and files without an extension
+        if index.name(file_id).startswith('.'):
+            continue
+        ext = index.extensions[ext_id]
+        if ext:
+            extensions[ext] += 1
     
     return extensions
 
-def detect_frameworks(directory):
-    """Detect frameworks used in the project."""
+def detect_declared_frameworks(directory):
+    """Detect frameworks declared in the project's manifest files."""
     frameworks = set()
     
     # Check for package.json for Node.js projects
@@ -98,60 +382,67 @@ def detect_frameworks(directory):
     if os.path.exists(os.path.join(directory, "manage.py")):
         frameworks.add("Django")
     
-    # Check for Flask project
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(".py"):
-                try:
-                    with open(os.path.join(root, file), 'r') as f:
-                        content = f.read().lower()
-                        if "from flask import" in content or "import flask" in content:
-                            frameworks.add("Flask")
-                            break
-                except:
-                    continue
+    return frameworks
+
+def detect_frameworks(directory, index=None):
+    """Detect frameworks used in the project."""
+    if index is None:
+        index = build_file_index(directory)
+    frameworks = detect_declared_frameworks(directory)
+    
+    # Add frameworks found by scanning source files (e.g. Flask imports)
+    scan_index(index, ("frameworks",))
+    frameworks.update(index.labels("frameworks"))
     
     return frameworks
 
-def identify_languages(directory):
+# Map extensions to languages
+LANGUAGE_MAPPING = {
+    "js": "JavaScript",
+    "ts": "TypeScript",
+    "jsx": "React JSX",
+    "tsx": "React TSX",
+    "py": "Python",
+    "rb": "Ruby",
+    "php": "PHP",
+    "java": "Java",
+    "go": "Go",
+    "cs": "C#",
+    "cpp": "C++",
+    "c": "C",
+    "swift": "Swift",
+    "kt": "Kotlin",
+    "rs": "Rust",
+    "dart": "Dart",
+    "html": "HTML",
+    "css": "CSS",
+    "scss": "SCSS",
+    "sass": "Sass",
+    "less": "Less",
+    "sql": "SQL",
+    "md": "Markdown",
+    "json": "JSON",
+    "xml": "XML",
+    "yaml": "YAML",
+    "yml": "YAML",
+}
+
+def count_languages(extensions):
+    """Aggregate per-extension file counts into per-language file counts."""
+    languages = defaultdict(int)
+    for ext, count in extensions.items():
+        if ext in LANGUAGE_MAPPING:
+            languages[LANGUAGE_MAPPING[ext]] += count
+    return dict(languages)
+
+def identify_languages(directory, index=None):
     """Identify programming languages used in the project."""
     languages = set()
-    extensions = count_files_by_extension(directory)
-    
-    # Map extensions to languages
-    language_mapping = {
-        "js": "JavaScript",
-        "ts": "TypeScript",
-        "jsx": "React JSX",
-        "tsx": "React TSX",
-        "py": "Python",
-        "rb": "Ruby",
-        "php": "PHP",
-        "java": "Java",
-        "go": "Go",
-        "cs": "C#",
-        "cpp": "C++",
-        "c": "C",
-        "swift": "Swift",
-        "kt": "Kotlin",
-        "rs": "Rust",
-        "dart": "Dart",
-        "html": "HTML",
-        "css": "CSS",
-        "scss": "SCSS",
-        "sass": "Sass",
-        "less": "Less",
-        "sql": "SQL",
-        "md": "Markdown",
-        "json": "JSON",
-        "xml": "XML",
-        "yaml": "YAML",
-        "yml": "YAML",
-    }
+    extensions = count_files_by_extension(directory, index)
     
     for ext, count in extensions.items():
-        if ext in language_mapping:
-            languages.add(f"{language_mapping[ext]} ({count} files)")
+        if ext in LANGUAGE_MAPPING:
+            languages.add(f"{LANGUAGE_MAPPING[ext]} ({count} files)")
     
     return languages
 
@@ -223,131 +514,429 @@ def find_important_files(directory):
     
     return important_files
 
-def find_api_routes(directory):
+# Express.js routes
+EXPRESS_ROUTE_REGEX = re.compile(r'(app|router)\.(get|post|put|delete|patch)\s*\(\s*[\'"]([^\'"]+)[\'"]')
+
+# Flask routes
+FLASK_ROUTE_REGEX = re.compile(r'@app.route\s*\(\s*[\'"]([^\'"]+)[\'"]')
+
+# Django URL patterns
+DJANGO_URL_REGEX = re.compile(r'path\s*\(\s*[\'"]([^\'"]+)[\'"]')
+
+# Common database imports and configurations
+DATABASE_PATTERNS = [
+    (re.compile(r'mongoose\.connect'), 'MongoDB (Mongoose)'),
+    (re.compile(r'createConnection.*mysql'), 'MySQL'),
+    (re.compile(r'new\s+Sequelize'), 'PostgreSQL/MySQL (Sequelize)'),
+    (re.compile(r'psycopg2'), 'PostgreSQL (psycopg2)'),
+    (re.compile(r'sqlite3'), 'SQLite'),
+    (re.compile(r'MongoClient'), 'MongoDB'),
+    (re.compile(r'db = SQLAlchemy'), 'SQL (SQLAlchemy)'),
+    (re.compile(r'DATABASES\s*=\s*{'), 'Django Database Configuration')
+]
+
+# Internationalization libraries
+I18N_PATTERNS = [
+    (re.compile(r'i18n'), 'i18n library'),
+    (re.compile(r'i18next'), 'i18next library'),
+    (re.compile(r'react-intl'), 'react-intl library'),
+    (re.compile(r'vue-i18n'), 'vue-i18n library'),
+    (re.compile(r'gettext'), 'gettext library'),
+    (re.compile(r'_\(\s*[\'"]'), 'gettext translation function'),
+    (re.compile(r'babel.localeselector'), 'Flask-Babel'),
+    (re.compile(r'django\.utils\.translation'), 'Django Translation'),
+    (re.compile(r'makemessages'), 'Django Internationalization'),
+    (re.compile(r'gettext_lazy'), 'Django Lazy Translation')
+]
+
+def _scan_flask(index, file_id, content):
+    content = content.lower()
+    if "from flask import" in content or "import flask" in content:
+        yield "frameworks", "Flask"
+
+def _scan_api_routes(index, file_id, content):
+    for match in EXPRESS_ROUTE_REGEX.findall(content):
+        yield "api_routes", f"{match[2]} ({match[1].upper()})"
+    for match in FLASK_ROUTE_REGEX.findall(content):
+        yield "api_routes", match
+    for match in DJANGO_URL_REGEX.findall(content):
+        yield "api_routes", match
+
+def _scan_database(index, file_id, content):
+    for pattern, db_type in DATABASE_PATTERNS:
+        if pattern.search(content):
+            yield "database", db_type
+
+def _scan_i18n(index, file_id, content):
+    for pattern, feature_desc in I18N_PATTERNS:
+        if pattern.search(content):
+            yield "i18n", feature_desc
+
+    # Look for translation files
+    root = index.dir_path(file_id).lower()
+    if 'translations' in root or 'locales' in root or 'i18n' in root:
+        if index.extension(file_id) == 'json':
+            yield "translations", "Translation file"
+
+# Detectors that need to read file contents: name -> (extensions, scanner, categories)
+CONTENT_DETECTORS = {
+    "frameworks": (("py",), _scan_flask, ("frameworks",)),
+    "api_routes": (("js", "py"), _scan_api_routes, ("api_routes",)),
+    "database": (("js", "py"), _scan_database, ("database",)),
+    "i18n": (("js", "py", "json"), _scan_i18n, ("i18n", "translations")),
+}
+
+DETECTORS = ("frameworks", "languages", "entry_points", "important_files", "api_routes", "database", "i18n", "sizes")
+
+def scan_index(index, detectors, jobs=1, on_finding=None, cached_hits=None):
+    """Run the content detectors over the indexed files, reading each file once.
+
+    Hits are recorded in the index. *on_finding* is called with a Finding for
+    every hit as soon as its file has been scanned, in file order. Files with
+    an entry in *cached_hits* (file id -> hits) are not read again.
+    """
+    selected = [CONTENT_DETECTORS[name] for name in detectors if name in CONTENT_DETECTORS]
+    if not selected:
+        return
+    wanted = set()
+    for extensions, _, _ in selected:
+        wanted.update(extensions)
+    file_ids = list(index.files_with_extensions(wanted))
+
+    def scan_file(file_id):
+        if cached_hits is not None and file_id in cached_hits:
+            return cached_hits[file_id]
+        content = index.read_text(file_id)
+        if content is None:
+            return []
+        ext = index.extension(file_id)
+        hits = []
+        for extensions, scanner, _ in selected:
+            if ext in extensions:
+                hits.extend(scanner(index, file_id, content))
+        return list(dict.fromkeys(hits))
+
+    if jobs > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            _record_hits(index, file_ids, pool.map(scan_file, file_ids), on_finding)
+    else:
+        _record_hits(index, file_ids, map(scan_file, file_ids), on_finding)
+
+def _record_hits(index, file_ids, results, on_finding):
+    for file_id, hits in zip(file_ids, results):
+        for category, label in hits:
+            index.mark(category, label, file_id)
+            if on_finding is not None:
+                on_finding(Finding(category, label, index.relpath(file_id)))
+
+def find_api_routes(directory, index=None):
     """Find API routes in the codebase."""
-    api_routes = []
-    
-    # Express.js routes
-    express_route_regex = r'(app|router)\.(get|post|put|delete|patch)\s*\(\s*[\'"]([^\'"]+)[\'"]'
-    
-    # Flask routes
-    flask_route_regex = r'@app.route\s*\(\s*[\'"]([^\'"]+)[\'"]'
-    
-    # Django URL patterns
-    django_url_regex = r'path\s*\(\s*[\'"]([^\'"]+)[\'"]'
-    
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(('.js', '.py')):
-                try:
-                    with open(os.path.join(root, file), 'r') as f:
-                        content = f.read()
-                        
-                        # Check for Express.js routes
-                        express_matches = re.findall(express_route_regex, content)
-                        for match in express_matches:
-                            api_routes.append(f"{match[2]} ({match[1].upper()}) - {file}")
-                        
-                        # Check for Flask routes
-                        flask_matches = re.findall(flask_route_regex, content)
-                        for match in flask_matches:
-                            api_routes.append(f"{match} - {file}")
-                        
-                        # Check for Django URL patterns
-                        django_matches = re.findall(django_url_regex, content)
-                        for match in django_matches:
-                            api_routes.append(f"{match} - {file}")
-                except:
-                    continue
-    
-    return api_routes
-
-def find_database_config(directory):
+    if index is None:
+        index = build_file_index(directory)
+    scan_index(index, ("api_routes",))
+    return [f"{route} - {index.name(file_id)}" for route, file_id in index.findings("api_routes")]
+
+def find_database_config(directory, index=None):
     """Find database configuration in the codebase."""
-    database_info = []
-    
-    # Check for common database imports and configurations
-    database_patterns = [
-        (r'mongoose\.connect', 'MongoDB (Mongoose)'),
-        (r'createConnection.*mysql', 'MySQL'),
-        (r'new\s+Sequelize', 'PostgreSQL/MySQL (Sequelize)'),
-        (r'psycopg2', 'PostgreSQL (psycopg2)'),
-        (r'sqlite3', 'SQLite'),
-        (r'MongoClient', 'MongoDB'),
-        (r'db = SQLAlchemy', 'SQL (SQLAlchemy)'),
-        (r'DATABASES\s*=\s*{', 'Django Database Configuration')
-    ]
-    
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(('.js', '.py')):
-                try:
-                    with open(os.path.join(root, file), 'r') as f:
-                        content = f.read()
-                        
-                        for pattern, db_type in database_patterns:
-                            if re.search(pattern, content):
-                                database_info.append(f"{db_type} - {file}")
-                except:
-                    continue
-    
-    return database_info
-
-def analyze_multilingual_features(directory):
+    if index is None:
+        index = build_file_index(directory)
+    scan_index(index, ("database",))
+    return [f"{db_type} - {index.name(file_id)}" for db_type, file_id in index.findings("database")]
+
+def analyze_multilingual_features(directory, index=None):
     """Analyze multilingual features of the application."""
-    features = []
-    
-    # Look for internationalization libraries
-    i18n_patterns = [
-        (r'i18n', 'i18n library'),
-        (r'i18next', 'i18next library'),
-        (r'react-intl', 'react-intl library'),
-        (r'vue-i18n', 'vue-i18n library'),
-        (r'gettext', 'gettext library'),
-        (r'_\(\s*[\'"]', 'gettext translation function'),
-        (r'babel.localeselector', 'Flask-Babel'),
-        (r'django\.utils\.translation', 'Django Translation'),
-        (r'makemessages', 'Django Internationalization'),
-        (r'gettext_lazy', 'Django Lazy Translation')
-    ]
-    
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(('.js', '.py', '.json')):
-                try:
-                    with open(os.path.join(root, file), 'r') as f:
-                        content = f.read()
-                        
-                        for pattern, feature_desc in i18n_patterns:
-                            if re.search(pattern, content):
-                                features.append(f"{feature_desc} - {file}")
-                                
-                        # Look for translation files
-                        if 'translations' in root.lower() or 'locales' in root.lower() or 'i18n' in root.lower():
-                            if file.endswith(('.json', '.po', '.mo')):
-                                features.append(f"Translation file - {os.path.join(root, file)}")
-                except:
-                    continue
-    
+    if index is None:
+        index = build_file_index(directory)
+    scan_index(index, ("i18n",))
+    features = [f"{desc} - {index.name(file_id)}" for desc, file_id in index.findings("i18n")]
+    features.extend(f"{desc} - {index.path(file_id)}" for desc, file_id in index.findings("translations"))
     return features
 
-def generate_project_report(directory):
-    """Generate a comprehensive report about the project."""
-    if not os.path.exists(directory):
-        print(f"Error: Directory '{directory}' does not exist.")
-        return
-    
-    print(f"Analyzing project in '{directory}'...")
-    
-    # Collect project information
-    extensions = count_files_by_extension(directory)
-    frameworks = detect_frameworks(directory)
-    languages = identify_languages(directory)
-    entry_points = find_entry_points(directory)
-    important_files = find_important_files(directory)
-    api_routes = find_api_routes(directory)
-    database_info = find_database_config(directory)
-    multilingual_features = analyze_multilingual_features(directory)
+# Upper bounds of the log-scale size histogram buckets: 1 KiB, 4 KiB, ..., 64 MiB
+SIZE_BUCKET_LIMITS = [1024 * 4 ** k for k in range(9)]
+
+def format_size(size):
+    """Format a byte count for humans, e.g. ``832.3 KiB``."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def _bucket_label(bucket):
+    low = SIZE_BUCKET_LIMITS[bucket - 1] if bucket else 0
+    if bucket == len(SIZE_BUCKET_LIMITS):
+        return f">= {format_size(low)}"
+    return f"{format_size(low)} - {format_size(SIZE_BUCKET_LIMITS[bucket])}"
+
+def size_histogram(sizes):
+    """Count files and bytes per log-scale size bucket; returns ``(label, files, bytes)`` rows."""
+    counts = [0] * (len(SIZE_BUCKET_LIMITS) + 1)
+    totals = [0] * (len(SIZE_BUCKET_LIMITS) + 1)
+    for size in sizes:
+        bucket = bisect_right(SIZE_BUCKET_LIMITS, size)
+        counts[bucket] += 1
+        totals[bucket] += size
+    return [(_bucket_label(bucket), counts[bucket], totals[bucket])
+            for bucket in range(len(counts)) if counts[bucket]]
+
+def directory_totals(index):
+    """Return an array of byte totals per directory id, including subdirectories."""
+    totals = array('q', index.directory_bytes)
+    # Visit the deepest directories first so every child is complete before its parent
+    depth = [d.count(os.sep) + 1 if d else 0 for d in index.dirs]
+    for dir_id in sorted(range(len(index.dirs)), key=depth.__getitem__, reverse=True):
+        rel_dir = index.dirs[dir_id]
+        if not rel_dir:
+            continue
+        parent_id = index._dir_ids.get(os.path.dirname(rel_dir))
+        if parent_id is not None:
+            totals[parent_id] += totals[dir_id]
+    return totals
+
+class SizeReport:
+    """Where the bytes in a project are: totals, histogram and the largest items."""
+
+    __slots__ = ("total_bytes", "histogram", "by_extension", "largest_files", "largest_directories")
+
+    def __init__(self, total_bytes, histogram, by_extension, largest_files, largest_directories):
+        self.total_bytes = total_bytes
+        self.histogram = histogram
+        self.by_extension = by_extension
+        self.largest_files = largest_files
+        self.largest_directories = largest_directories
+
+    def to_dict(self):
+        return {
+            "total_bytes": self.total_bytes,
+            "histogram": [{"range": label, "files": files, "bytes": size}
+                          for label, files, size in self.histogram],
+            "by_extension": [{"extension": ext, "files": files, "bytes": size}
+                             for ext, files, size in self.by_extension],
+            "largest_files": [{"path": path, "bytes": size} for path, size in self.largest_files],
+            "largest_directories": [{"path": path, "bytes": size}
+                                    for path, size in self.largest_directories],
+        }
+
+def summarize_sizes(index, top=10):
+    """Build a SizeReport from the sizes recorded in the index.
+
+    The top-N lists are selected with bounded heaps (heapq.nlargest), so
+    memory beyond the index itself does not grow with the size of the tree.
+    """
+    file_counts = array('q', bytes(8 * len(index.extensions)))
+    for ext_id in index.ext_ids:
+        file_counts[ext_id] += 1
+    by_extension = [
+        (index.extensions[ext_id] or "(none)", file_counts[ext_id], size)
+        for size, ext_id in heapq.nlargest(
+            top, ((size, ext_id) for ext_id, size in enumerate(index.extension_bytes) if file_counts[ext_id])
+        )
+    ]
+    largest_files = [
+        (index.relpath(file_id), size)
+        for size, file_id in heapq.nlargest(top, zip(index.sizes, range(len(index))))
+    ]
+    totals = directory_totals(index)
+    largest_directories = [
+        (index.dirs[dir_id], size)
+        for size, dir_id in heapq.nlargest(
+            top, ((size, dir_id) for dir_id, size in enumerate(totals) if index.dirs[dir_id])
+        )
+    ]
+    return SizeReport(
+        sum(index.sizes),
+        size_histogram(index.sizes),
+        by_extension,
+        largest_files,
+        largest_directories,
+    )
+
+class Finding:
+    """A single detector hit in one file."""
+
+    __slots__ = ("category", "label", "path")
+
+    def __init__(self, category, label, path):
+        self.category = category
+        self.label = label
+        self.path = path
+
+    def __repr__(self):
+        return f"Finding({self.category!r}, {self.label!r}, {self.path!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return (self.category, self.label, self.path) == (other.category, other.label, other.path)
+
+    def __hash__(self):
+        return hash((self.category, self.label, self.path))
+
+    def to_dict(self):
+        return {"category": self.category, "label": self.label, "path": self.path}
+
+class AnalysisResult:
+    """Everything analyze() found in a project."""
+
+    __slots__ = (
+        "directory", "file_count", "extensions", "frameworks", "languages",
+        "entry_points", "important_files", "findings", "sizes", "index",
+    )
+
+    def __init__(self, directory, index, extensions=None, frameworks=(), languages=None,
+                 entry_points=(), important_files=(), findings=(), sizes=None):
+        self.directory = directory
+        self.index = index
+        self.file_count = len(index)
+        self.extensions = dict(extensions or {})
+        self.frameworks = sorted(frameworks)
+        self.languages = dict(languages or {})
+        self.entry_points = list(entry_points)
+        self.important_files = list(important_files)
+        self.findings = list(findings)
+        self.sizes = sizes
+
+    def findings_for(self, *categories):
+        return [finding for finding in self.findings if finding.category in categories]
+
+    @property
+    def api_routes(self):
+        return [f"{f.label} - {os.path.basename(f.path)}" for f in self.findings_for("api_routes")]
+
+    @property
+    def database_info(self):
+        return [f"{f.label} - {os.path.basename(f.path)}" for f in self.findings_for("database")]
+
+    @property
+    def multilingual_features(self):
+        features = [f"{f.label} - {os.path.basename(f.path)}" for f in self.findings_for("i18n")]
+        features.extend(f"{f.label} - {os.path.join(self.directory, f.path)}"
+                        for f in self.findings_for("translations"))
+        return features
+
+    def summary(self):
+        """Return the project-level results as a JSON-serializable dict."""
+        return {
+            "directory": self.directory,
+            "file_count": self.file_count,
+            "extensions": self.extensions,
+            "frameworks": self.frameworks,
+            "languages": self.languages,
+            "entry_points": self.entry_points,
+            "important_files": self.important_files,
+            "sizes": self.sizes.to_dict() if self.sizes is not None else None,
+        }
+
+    def to_dict(self):
+        data = self.summary()
+        data["findings"] = [finding.to_dict() for finding in self.findings]
+        return data
+
+    def to_markdown(self):
+        return render_markdown(self)
+
+CACHE_VERSION = 3
+
+def _load_cached_hits(cache, index, detectors):
+    """Map file ids of *index* to hits recorded for the same unchanged file in *cache*."""
+    try:
+        with open(cache, 'r') as f:
+            data = json.load(f)
+        if data.get("version") != CACHE_VERSION or not set(detectors) <= set(data["detectors"]):
+            return None
+        cached = FileIndex.from_dict(data["index"])
+    except (OSError, ValueError, KeyError):
+        return None
+    if os.path.abspath(cached.root) != os.path.abspath(index.root):
+        return None
+
+    categories = {category for name in detectors for category in CONTENT_DETECTORS[name][2]}
+    cached_hits = defaultdict(list)
+    for category in categories:
+        for label, cached_id in cached.findings(category):
+            cached_hits[cached_id].append((category, label))
+
+    cached_ids = {cached.relpath(cached_id): cached_id for cached_id in range(len(cached))}
+    reusable = {}
+    for file_id in range(len(index)):
+        cached_id = cached_ids.get(index.relpath(file_id))
+        if (cached_id is not None and cached.sizes[cached_id] == index.sizes[file_id]
+                and cached.mtimes[cached_id] == index.mtimes[file_id]):
+            reusable[file_id] = cached_hits.get(cached_id, [])
+    return reusable
+
+def _save_cache(cache, index, detectors):
+    data = {"version": CACHE_VERSION, "detectors": list(detectors), "index": index.to_dict()}
+    tmp_path = f"{cache}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, cache)
+
+def check_detectors(detectors):
+    """Raise ValueError if *detectors* names anything not in DETECTORS."""
+    unknown = set(detectors) - set(DETECTORS)
+    if unknown:
+        raise ValueError(f"Unknown detectors: {', '.join(sorted(unknown))}")
+
+def analyze(directory, *, detectors=DETECTORS, jobs=1, cache=None, on_finding=None, top=10):
+    """Analyze a project directory and return an AnalysisResult.
+
+    *detectors* selects which of DETECTORS run. *jobs* is the number of
+    threads used to read and scan files. *cache* is the path of a cache file;
+    files whose size and mtime match the cached index are not read again.
+    *on_finding* is called with each Finding while the scan is running.
+    *top* limits the largest files/directories/extensions lists.
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Directory '{directory}' does not exist.")
+    check_detectors(detectors)
+
+    # Index the tree once and let every detector record its hits in it
+    index = build_file_index(directory)
+    content_detectors = [name for name in DETECTORS if name in detectors and name in CONTENT_DETECTORS]
+
+    cached_hits = None
+    if cache is not None and content_detectors:
+        cached_hits = _load_cached_hits(cache, index, content_detectors)
+    scan_index(index, content_detectors, jobs=jobs, on_finding=on_finding, cached_hits=cached_hits)
+    if cache is not None and content_detectors:
+        _save_cache(cache, index, content_detectors)
+
+    extensions = count_files_by_extension(directory, index)
+    frameworks = set()
+    if "frameworks" in detectors:
+        frameworks = detect_declared_frameworks(directory) | set(index.labels("frameworks"))
+
+    findings = [
+        Finding(category, label, index.relpath(file_id))
+        for name in content_detectors
+        for category in CONTENT_DETECTORS[name][2]
+        for label, file_id in index.findings(category)
+    ]
+
+    return AnalysisResult(
+        directory,
+        index,
+        extensions=extensions,
+        frameworks=frameworks,
+        languages=count_languages(extensions) if "languages" in detectors else None,
+        entry_points=find_entry_points(directory) if "entry_points" in detectors else (),
+        important_files=find_important_files(directory) if "important_files" in detectors else (),
+        findings=findings,
+        sizes=summarize_sizes(index, top) if "sizes" in detectors else None,
+    )
+
+def render_markdown(result):
+    """Render an AnalysisResult as the Markdown project report."""
+    directory = result.directory
+    frameworks = result.frameworks
+    languages = [f"{language} ({count} files)" for language, count in result.languages.items()]
+    entry_points = result.entry_points
+    important_files = result.important_files
+    api_routes = result.api_routes
+    database_info = result.database_info
+    multilingual_features = result.multilingual_features
     
     # Generate report
     report = "# Multilingua Project Analysis\n\n"
@@ -398,6 +987,36 @@ def generate_project_report(directory):
             report += f"- {feature}\n"
         report += "\n"
     
+    if result.sizes is not None and result.sizes.total_bytes:
+        sizes = result.sizes
+        report += "## Large Files and Hotspots\n\n"
+        report += f"Total size: {format_size(sizes.total_bytes)} in {result.file_count} files\n\n"
+        
+        report += "### File Size Distribution\n\n"
+        report += "| Size | Files | Total | |\n|---|---:|---:|---|\n"
+        most_files = max(files for _, files, _ in sizes.histogram)
+        for label, files, size in sizes.histogram:
+            bar = "#" * max(1, round(20 * files / most_files))
+            report += f"| {label} | {files} | {format_size(size)} | `{bar}` |\n"
+        report += "\n"
+        
+        report += "### Largest File Types\n\n"
+        report += "| Extension | Files | Total | Share |\n|---|---:|---:|---:|\n"
+        for ext, files, size in sizes.by_extension:
+            report += f"| {ext} | {files} | {format_size(size)} | {100 * size / sizes.total_bytes:.1f}% |\n"
+        report += "\n"
+        
+        report += "### Largest Files\n\n"
+        for path, size in sizes.largest_files:
+            report += f"- {path} ({format_size(size)})\n"
+        report += "\n"
+        
+        if sizes.largest_directories:
+            report += "### Largest Directories\n\n"
+            for path, size in sizes.largest_directories:
+                report += f"- {path}/ ({format_size(size)})\n"
+            report += "\n"
+    
     report += "## File Structure\n\n"
     report += "```\n"
     
@@ -484,18 +1103,115 @@ def generate_project_report(directory):
     
     report += "- Always test thoroughly after making changes to ensure functionality is preserved.\n"
     
+    return report
+
+def default_report_path(directory):
+    """Return where the Markdown report is written when no output is given."""
+    return os.path.join(os.path.dirname(directory), "PROJECT_ANALYSIS.md")
+
+def generate_project_report(directory, report_path=None, **kwargs):
+    """Generate a comprehensive report about the project."""
+    if not os.path.exists(directory):
+        print(f"Error: Directory '{directory}' does not exist.")
+        return
+    
+    print(f"Analyzing project in '{directory}'...")
+    result = analyze(directory, **kwargs)
+    
     # Write the report to a Markdown file
-    report_path = os.path.join(os.path.dirname(directory), "PROJECT_ANALYSIS.md")
+    if report_path is None:
+        report_path = default_report_path(directory)
     with open(report_path, 'w') as f:
-        f.write(report)
+        f.write(render_markdown(result))
     
     print(f"Analysis complete! Report saved to {report_path}")
     return report_path
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python analyze_project.py <directory>")
-        sys.exit(1)
+def parse_args(argv=None):
+    import argparse
     
-    directory = sys.argv[1]
-    generate_project_report(directory)
+    parser = argparse.ArgumentParser(description="Analyze a project and report on its structure.")
+    parser.add_argument("directory", help="project directory to analyze")
+    parser.add_argument(
+        "--format",
+        choices=("md", "json", "ndjson"),
+        default="md",
+        help="output format (default: md)",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="output file; '-' for stdout (default: PROJECT_ANALYSIS.md next to the "
+             "directory for md, stdout otherwise)",
+    )
+    parser.add_argument(
+        "--detectors",
+        help=f"comma-separated detectors to run (default: {','.join(DETECTORS)})",
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="threads used to scan files")
+    parser.add_argument("--cache", help="cache file used to skip unchanged files")
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="number of largest files, directories and file types to report (default: 10)",
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    detectors = DETECTORS
+    if args.detectors:
+        detectors = tuple(name.strip() for name in args.detectors.split(",") if name.strip())
+    options = {"detectors": detectors, "jobs": max(1, args.jobs), "cache": args.cache, "top": max(1, args.top)}
+    
+    if not os.path.isdir(args.directory):
+        print(f"Error: Directory '{args.directory}' does not exist.", file=sys.stderr)
+        return 1
+    try:
+        check_detectors(detectors)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    
+    try:
+        if args.format == "md" and args.output != "-":
+            generate_project_report(args.directory, args.output, **options)
+            return 0
+        
+        if args.output and args.output != "-":
+            out = open(args.output, 'w')
+        else:
+            out = sys.stdout
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    try:
+        if args.format == "md":
+            out.write(render_markdown(analyze(args.directory, **options)))
+        elif args.format == "json":
+            json.dump(analyze(args.directory, **options).to_dict(), out, indent=2)
+            out.write("\n")
+        else:
+            # Stream findings while the scan is still running
+            def emit(record):
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+            
+            emit({"type": "start", "directory": args.directory})
+            result = analyze(
+                args.directory,
+                on_finding=lambda finding: emit({"type": "finding", **finding.to_dict()}),
+                **options,
+            )
+            emit({"type": "summary", **result.summary()})
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Asyncio supervisor for running the Multilingua development stack.
+
+Starts several child processes concurrently, prefixes and multiplexes their
+output, restarts crashed children with exponential backoff and shuts
+everything down cleanly on SIGINT/SIGTERM. Start order is driven by
+declared dependencies and readiness probes instead of fixed sleeps.
+"""
+import asyncio
+import os
+import re
+import signal
+import sys
+import time
+
+
+class ProcessSpec:
+    """Description of one supervised child process.
+
+    A process becomes *ready* when:
+    - ``oneshot`` is true and it exited with status 0 (e.g. ``npm install``),
+    - ``ready_port`` is set and a TCP connection to that port succeeds,
+    - ``ready_pattern`` is set and a line of its output matches it,
+    - otherwise, as soon as it has been spawned.
+    Processes listed in ``depends_on`` must be ready before this one starts.
+    With ``ready_timeout`` set, a process that is not ready within that many
+    seconds of being spawned is stopped and handled like a crash.
+    """
+
+    def __init__(self, name, command, cwd=None, env=None, depends_on=(),
+                 oneshot=False, ready_port=None, ready_host="127.0.0.1",
+                 ready_pattern=None, ready_timeout=None, restart=True,
+                 max_restarts=5, backoff=1.0, max_backoff=30.0, required=True):
+        self.name = name
+        self.command = list(command)
+        self.cwd = cwd
+        self.env = env
+        self.depends_on = tuple(depends_on)
+        self.oneshot = oneshot
+        self.ready_port = ready_port
+        self.ready_host = ready_host
+        self.ready_pattern = re.compile(ready_pattern) if ready_pattern else None
+        self.ready_timeout = ready_timeout
+        self.restart = restart
+        self.max_restarts = max_restarts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # When a required process fails for good, the whole stack stops.
+        self.required = required
+
+
+class Supervisor:
+    """Run a set of ProcessSpecs until they finish or a stop is requested."""
+
+    # A child that stayed up this long gets its backoff reset after a crash.
+    STABLE_AFTER = 30.0
+    # Output is read in chunks of this size; longer lines are logged in pieces.
+    READ_CHUNK = 64 * 1024
+
+    def __init__(self, specs, stop_timeout=10.0, probe_interval=0.25, out=None):
+        names = [spec.name for spec in specs]
+        if len(set(names)) != len(names):
+            raise ValueError("Process names must be unique")
+        for spec in specs:
+            for dep in spec.depends_on:
+                if dep not in names:
+                    raise ValueError(f"{spec.name} depends on unknown process {dep!r}")
+        self.specs = {spec.name: spec for spec in specs}
+        self._check_cycles()
+        self.stop_timeout = stop_timeout
+        self.probe_interval = probe_interval
+        self.out = out or sys.stdout
+        self._width = max((len(name) for name in names), default=0)
+        self._ready = {}
+        self._failed = {}
+        self._procs = {}
+        self._stopping = None
+        self._exit_code = 0
+
+    def _check_cycles(self):
+        """Raise ValueError if the dependencies contain a cycle."""
+        done = set()
+        for start in self.specs:
+            if start in done:
+                continue
+            # Iterative depth-first search; *path* holds the current chain
+            path = [start]
+            on_path = {start}
+            stack = [iter(self.specs[start].depends_on)]
+            while stack:
+                dep = next(stack[-1], None)
+                if dep is None:
+                    stack.pop()
+                    finished = path.pop()
+                    on_path.discard(finished)
+                    done.add(finished)
+                    continue
+                if dep in on_path:
+                    cycle = path[path.index(dep):] + [dep]
+                    raise ValueError(f"Dependency cycle: {' -> '.join(cycle)}")
+                if dep not in done:
+                    path.append(dep)
+                    on_path.add(dep)
+                    stack.append(iter(self.specs[dep].depends_on))
+
+    def log(self, name, line):
+        self.out.write(f"[{name.ljust(self._width)}] {line}\n")
+        self.out.flush()
+
+    def stop(self, reason=None):
+        """Request a clean shutdown of every child."""
+        if self._stopping is not None and not self._stopping.is_set():
+            if reason:
+                self.log("supervisor", reason)
+            self._stopping.set()
+
+    async def run(self):
+        """Start every process and supervise until done; return an exit status."""
+        self._width = max(self._width, len("supervisor"))
+        self._stopping = asyncio.Event()
+        self._ready = {name: asyncio.Event() for name in self.specs}
+        self._failed = {name: asyncio.Event() for name in self.specs}
+
+        loop = asyncio.get_running_loop()
+        installed = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop, f"Received {signal.Signals(sig).name}, shutting down...")
+                installed.append(sig)
+            except (NotImplementedError, RuntimeError):
+                # Signal handlers are unavailable on Windows event loops.
+                pass
+
+        tasks = [asyncio.create_task(self._guard(spec)) for spec in self.specs.values()]
+        stopper = asyncio.create_task(self._stopping.wait())
+        try:
+            pending = set(tasks)
+            while pending and not self._stopping.is_set():
+                done, pending = await asyncio.wait(pending | {stopper}, return_when=asyncio.FIRST_COMPLETED)
+                pending.discard(stopper)
+        except asyncio.CancelledError:
+            self.stop("Cancelled, shutting down...")
+        finally:
+            self._stopping.set()
+            await self._shutdown()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            stopper.cancel()
+            for sig in installed:
+                loop.remove_signal_handler(sig)
+        return self._exit_code
+
+    async def _wait_for_dependencies(self, spec):
+        for dep in spec.depends_on:
+            if not self._ready[dep].is_set():
+                self.log(spec.name, f"Waiting for {dep}")
+            ready = asyncio.create_task(self._ready[dep].wait())
+            failed = asyncio.create_task(self._failed[dep].wait())
+            stopping = asyncio.create_task(self._stopping.wait())
+            await asyncio.wait({ready, failed, stopping}, return_when=asyncio.FIRST_COMPLETED)
+            for task in (ready, failed, stopping):
+                task.cancel()
+            if not self._ready[dep].is_set():
+                if self._failed[dep].is_set():
+                    self.log(spec.name, f"Not starting: dependency {dep} failed")
+                return False
+        return True
+
+    async def _guard(self, spec):
+        try:
+            await self._supervise(spec)
+        except Exception as e:
+            self.log(spec.name, f"Supervisor error: {e!r}")
+            self._fail(spec)
+
+    async def _supervise(self, spec):
+        if not await self._wait_for_dependencies(spec):
+            # A stop requested while waiting is not a failure of this process
+            if any(self._failed[dep].is_set() for dep in spec.depends_on):
+                self._fail(spec)
+            return
+
+        attempts = 0
+        delay = spec.backoff
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            returncode = await self._run_once(spec)
+            if self._stopping.is_set():
+                return
+            if returncode == 0 and spec.oneshot:
+                self._ready[spec.name].set()
+                return
+            if returncode == 0 and not spec.restart:
+                if not self._ready[spec.name].is_set():
+                    # Exited before becoming ready; release anything waiting on it
+                    self.log(spec.name, "Exited with status 0 before becoming ready")
+                    self._failed[spec.name].set()
+                return
+
+            self.log(spec.name, f"Exited with status {returncode}")
+            if not spec.restart or attempts >= spec.max_restarts:
+                self._fail(spec)
+                return
+            if time.monotonic() - started >= self.STABLE_AFTER:
+                attempts, delay = 0, spec.backoff
+            attempts += 1
+            self.log(spec.name, f"Restarting in {delay:.1f}s (attempt {attempts}/{spec.max_restarts})")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+                return
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, spec.max_backoff)
+
+    def _fail(self, spec):
+        self._failed[spec.name].set()
+        if spec.required:
+            self._exit_code = 1
+            self.stop(f"{spec.name} failed, stopping the stack")
+
+    async def _run_once(self, spec):
+        env = None
+        if spec.env:
+            env = {**os.environ, **spec.env}
+        self.log(spec.name, f"Starting: {' '.join(spec.command)}")
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *spec.command,
+                cwd=spec.cwd,
+                env=env,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                start_new_session=(os.name == "posix"),
+            )
+        except OSError as e:
+            self.log(spec.name, f"Failed to start: {e}")
+            return -1
+
+        self._procs[spec.name] = proc
+        probe = None
+        watchdog = None
+        try:
+            if self._stopping.is_set():
+                # A stop arrived while the child was being spawned
+                await self._terminate(spec.name, proc)
+                return proc.returncode
+            if spec.ready_port is not None:
+                probe = asyncio.create_task(self._probe_port(spec, proc))
+            elif spec.ready_pattern is None and not spec.oneshot:
+                self._mark_ready(spec)
+            if spec.ready_timeout is not None and not self._ready[spec.name].is_set():
+                watchdog = asyncio.create_task(self._watch_readiness(spec, proc))
+            await self._pump(spec, proc)
+            return await proc.wait()
+        finally:
+            for task in (probe, watchdog):
+                if task is not None:
+                    task.cancel()
+            # On errors and cancellation alike, never leave the child running in
+            # its own session, where Ctrl-C in the terminal cannot reach it
+            if proc.returncode is None:
+                await self._terminate(spec.name, proc)
+            self._procs.pop(spec.name, None)
+
+    def _mark_ready(self, spec):
+        if not self._ready[spec.name].is_set():
+            self._ready[spec.name].set()
+            if not spec.oneshot:
+                self.log(spec.name, "Ready")
+
+    async def _pump(self, spec, proc):
+        # StreamReader.readline() fails on lines over its limit, so split lines here
+        pending = b""
+        while True:
+            chunk = await proc.stdout.read(self.READ_CHUNK)
+            if not chunk:
+                if pending:
+                    self._log_output(spec, pending)
+                return
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            if len(pending) >= self.READ_CHUNK:
+                lines.append(pending)
+                pending = b""
+            for line in lines:
+                self._log_output(spec, line)
+
+    def _log_output(self, spec, line):
+        text = line.decode(errors="replace").rstrip("\r")
+        self.log(spec.name, text)
+        if spec.ready_pattern is not None and spec.ready_pattern.search(text):
+            self._mark_ready(spec)
+
+    async def _probe_port(self, spec, proc):
+        while proc.returncode is None:
+            try:
+                _, writer = await asyncio.open_connection(spec.ready_host, spec.ready_port)
+            except OSError:
+                await asyncio.sleep(self.probe_interval)
+                continue
+            writer.close()
+            self._mark_ready(spec)
+            return
+
+    async def _watch_readiness(self, spec, proc):
+        try:
+            await asyncio.wait_for(self._ready[spec.name].wait(), timeout=spec.ready_timeout)
+        except asyncio.TimeoutError:
+            self.log(spec.name, f"Not ready after {spec.ready_timeout:g}s, stopping it")
+            self._signal(proc, signal.SIGTERM)
+
+    def _signal(self, proc, sig):
+        try:
+            if os.name == "posix":
+                # Children run in their own session so npm's grandchildren go too.
+                os.killpg(proc.pid, sig)
+            else:
+                proc.send_signal(sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    async def _terminate(self, name, proc):
+        if proc.returncode is not None:
+            return
+        self.log(name, "Stopping...")
+        self._signal(proc, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=self.stop_timeout)
+        except asyncio.TimeoutError:
+            self.log(name, f"Did not stop within {self.stop_timeout:.0f}s, killing")
+            self._signal(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+            await proc.wait()
+
+    async def _shutdown(self):
+        # Sweep until nothing is left: a spawn may complete while we wait on others
+        while True:
+            procs = [(name, proc) for name, proc in self._procs.items() if proc.returncode is None]
+            if not procs:
+                return
+            for name, proc in procs:
+                self.log(name, "Stopping...")
+                self._signal(proc, signal.SIGTERM)
+            waiters = [asyncio.create_task(proc.wait()) for _, proc in procs]
+            _, pending = await asyncio.wait(waiters, timeout=self.stop_timeout)
+            if pending:
+                for name, proc in procs:
+                    if proc.returncode is None:
+                        self.log(name, f"Did not stop within {self.stop_timeout:.0f}s, killing")
+                        self._signal(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+def supervise(specs, **kwargs):
+    """Run *specs* under a Supervisor and return its exit status."""
+    try:
+        return asyncio.run(Supervisor(specs, **kwargs).run())
+    except KeyboardInterrupt:
+        return 130
@@ -2,17 +2,23 @@
 """
 Utility script to unzip and run the Multilingua web application.
 """
+# zipfile, shutil, json and friends are imported where they are used, so a
+# fast start (see load_fast_start_state) only pays for what it needs.
 import os
 import sys
-import zipfile
-import shutil
+import time
 import subprocess
-import json
-from pathlib import Path
 
 # Constants
 ZIP_FILE_NAME = "Multilingua-lartikonj-patch-1.zip"
 EXTRACT_DIR = "multilingua_app"
+VERIFY_BUFFER_SIZE = 1024 * 1024
+STATE_FILE = ".multilingua_state.json"
+STATE_VERSION = 1
+REPORT_FILE_NAME = "PROJECT_ANALYSIS.md"
+# Directories created by installs and builds, which are not part of the extracted tree
+MANIFEST_SKIP_DIRS = {"node_modules", "venv", ".venv", "env", "__pycache__", "dist", ".git"}
+DEPENDENCY_FILES = ("package.json", "package-lock.json", "requirements.txt")
 
 def find_zip_file():
     """Find the zip file in the current directory or subdirectories."""
@@ -39,29 +45,169 @@ def find_zip_file():
     
     return None
 
+def file_sha256(path, buffer_size=VERIFY_BUFFER_SIZE):
+    """Compute the SHA-256 digest of a file without loading it into memory."""
+    import hashlib
+    
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(buffer_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_sha256_sidecar(zip_path):
+    """Return the expected digest from ``<zip>.sha256`` if such a file exists."""
+    sidecar = f"{zip_path}.sha256"
+    if not os.path.exists(sidecar):
+        return None
+    with open(sidecar, 'r') as f:
+        # Accept both a bare digest and the "<digest>  <name>" sha256sum format
+        fields = f.read().split()
+    return fields[0].lower() if fields else None
+
+def verify_zip(zip_path, expected_sha256=None, workers=None, buffer_size=VERIFY_BUFFER_SIZE):
+    """Check the archive's integrity before anything on disk is touched.
+
+    Validates the central directory, then streams every member through its
+    CRC check on a thread pool (zlib releases the GIL while decompressing).
+    If an expected SHA-256 is given, or a ``.sha256`` sidecar exists, the
+    archive digest is checked at the same time. Returns a list of problems,
+    which is empty when the archive is sound.
+    """
+    import threading
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor
+    
+    if expected_sha256 is None:
+        try:
+            expected_sha256 = read_sha256_sidecar(zip_path)
+        except OSError as e:
+            return [f"Could not read checksum sidecar: {e}"]
+    
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            members = [info for info in zip_ref.infolist() if not info.is_dir()]
+    except (zipfile.BadZipFile, OSError) as e:
+        return [f"Invalid archive: {e}"]
+    
+    # ZipFile handles are not safe to share between threads, so each worker opens its own
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+    
+    def open_archive():
+        zip_ref = getattr(local, "zip_ref", None)
+        if zip_ref is None:
+            zip_ref = local.zip_ref = zipfile.ZipFile(zip_path, 'r')
+            with handles_lock:
+                handles.append(zip_ref)
+        return zip_ref
+    
+    def check_member(info):
+        try:
+            with open_archive().open(info) as member:
+                while member.read(buffer_size):
+                    pass
+        except Exception as e:
+            # BadZipFile for CRC mismatches, zlib.error/EOFError for damaged data
+            return f"{info.filename}: {e}"
+        return None
+    
+    def check_digest():
+        actual = file_sha256(zip_path, buffer_size)
+        if actual != expected_sha256:
+            return f"SHA-256 mismatch: expected {expected_sha256}, got {actual}"
+        return None
+    
+    if workers is None:
+        workers = min(8, os.cpu_count() or 1)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = []
+            if expected_sha256:
+                futures.append(pool.submit(check_digest))
+            futures.extend(pool.submit(check_member, info) for info in members)
+            problems = [problem for problem in (f.result() for f in futures) if problem]
+    finally:
+        for zip_ref in handles:
+            zip_ref.close()
+    
+    return problems
+
 def extract_zip(zip_path):
-    """Extract the zip file to the specified directory."""
+    """Verify the zip file and extract it to the specified directory.
+
+    The archive is checked first and extracted into a staging directory, which
+    only replaces the existing EXTRACT_DIR once extraction has succeeded.
+    Returns None, leaving the previous tree in place, if anything fails.
+    """
+    import shutil
+    import zipfile
+    
+    backup_dir = f"{EXTRACT_DIR}_backup"
+    if os.path.exists(backup_dir) and not os.path.exists(EXTRACT_DIR):
+        # A previous run stopped between the two renames; the backup is the only good tree
+        print(f"Restoring previous installation from {backup_dir}")
+        try:
+            os.rename(backup_dir, EXTRACT_DIR)
+        except OSError as e:
+            print(f"Error: Could not restore {backup_dir} to {EXTRACT_DIR}: {e}")
+            return None
+    
+    print(f"Verifying {zip_path}...")
+    problems = verify_zip(zip_path)
+    if problems:
+        print(f"Error: {zip_path} failed the integrity check:")
+        for problem in problems[:10]:
+            print(f"  - {problem}")
+        if len(problems) > 10:
+            print(f"  - ... and {len(problems) - 10} more problems")
+        return None
+    
     print(f"Extracting {zip_path} to {EXTRACT_DIR}...")
     
-    # Remove the extraction directory if it exists
+    # Extract next to the target so the final swap is a rename on the same filesystem
+    staging_dir = f"{EXTRACT_DIR}_staging"
+    for leftover in (staging_dir, backup_dir):
+        if os.path.exists(leftover):
+            shutil.rmtree(leftover, ignore_errors=True)
+    
+    try:
+        os.makedirs(staging_dir)
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            zip_ref.extractall(staging_dir)
+    except Exception as e:
+        print(f"Error: Extraction failed: {e}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return None
+    
+    # Swap the new tree in, keeping the old one until the rename has succeeded
     if os.path.exists(EXTRACT_DIR):
-        print(f"Removing existing directory: {EXTRACT_DIR}")
+        print(f"Replacing existing directory: {EXTRACT_DIR}")
         try:
-            shutil.rmtree(EXTRACT_DIR)
-        except Exception as e:
-            print(f"Warning: Could not remove existing directory: {e}")
-            # Try a different approach - move it instead
-            backup_dir = f"{EXTRACT_DIR}_backup"
-            if os.path.exists(backup_dir):
-                shutil.rmtree(backup_dir)
-            shutil.move(EXTRACT_DIR, backup_dir)
-    
-    # Create the extraction directory
-    os.makedirs(EXTRACT_DIR, exist_ok=True)
+            os.rename(EXTRACT_DIR, backup_dir)
+        except OSError as e:
+            print(f"Error: Could not move existing directory aside: {e}")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return None
+    try:
+        os.rename(staging_dir, EXTRACT_DIR)
+    except OSError as e:
+        print(f"Error: Could not move the extracted files into place: {e}")
+        if os.path.exists(backup_dir):
+            try:
+                os.rename(backup_dir, EXTRACT_DIR)
+            except OSError as e:
+                print(f"Error: Could not restore the previous installation: {e}")
+                print(f"The previous installation was left in {backup_dir}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return None
     
-    # Extract the zip file
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(EXTRACT_DIR)
+    if os.path.exists(backup_dir):
+        try:
+            shutil.rmtree(backup_dir)
+        except Exception as e:
+            print(f"Warning: Could not remove previous directory {backup_dir}: {e}")
     
     print(f"Successfully extracted to {EXTRACT_DIR}")
     return EXTRACT_DIR
@@ -117,7 +263,10 @@ def detect_project_type(extract_dir):
         return "unknown", extract_dir
 
 def setup_nodejs_project(extract_dir):
-    """Set up a Node.js project."""
+    """Set up a Node.js project.
+
+    Returns ``(start_command, dependencies_installed)``.
+    """
     print("Setting up Node.js project...")
     
     # Change to the project directory
@@ -125,13 +274,17 @@ def setup_nodejs_project(extract_dir):
     
     # Install dependencies
     print("Installing dependencies...")
+    installed = False
     try:
         subprocess.run(["npm", "install"], check=True)
         print("Dependencies installed successfully")
-    except subprocess.CalledProcessError:
+        installed = True
+    except (subprocess.CalledProcessError, OSError):
         print("Warning: Failed to install dependencies. The application may not run correctly.")
     
     # Determine how to start the application
+    import json
+    
     package_json_path = os.path.join(".", "package.json")
     if os.path.exists(package_json_path):
         with open(package_json_path, 'r') as file:
@@ -139,7 +292,7 @@ def setup_nodejs_project(extract_dir):
                 package_data = json.load(file)
                 if "scripts" in package_data and "start" in package_data["scripts"]:
                     print(f"Found start script: {package_data['scripts']['start']}")
-                    return ["npm", "start"]
+                    return ["npm", "start"], installed
             except json.JSONDecodeError:
                 print("Warning: Could not parse package.json")
     
@@ -148,13 +301,16 @@ def setup_nodejs_project(extract_dir):
     for file in server_files:
         if os.path.exists(file):
             print(f"Found server file: {file}")
-            return ["node", file]
+            return ["node", file], installed
     
     print("Could not determine how to start the Node.js application")
-    return None
+    return None, installed
 
 def setup_python_project(extract_dir):
-    """Set up a Python project."""
+    """Set up a Python project.
+
+    Returns ``(start_command, dependencies_installed)``.
+    """
     print("Setting up Python project...")
     
     # Change to the project directory
@@ -165,6 +321,7 @@ def setup_python_project(extract_dir):
     venv_exists = any(os.path.exists(d) for d in venv_dirs)
     
     # Install dependencies if requirements.txt exists
+    installed = True
     if os.path.exists("requirements.txt"):
         print("Installing dependencies from requirements.txt...")
         try:
@@ -182,8 +339,9 @@ def setup_python_project(extract_dir):
                 
             subprocess.run([pip_path, "install", "-r", "requirements.txt"], check=True)
             print("Dependencies installed successfully")
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, OSError):
             print("Warning: Failed to install dependencies. The application may not run correctly.")
+            installed = False
     
     # Check for common server files
     server_files = ["app.py", "main.py", "run.py", "wsgi.py", "application.py", "server.py"]
@@ -195,20 +353,23 @@ def setup_python_project(extract_dir):
             with open(file, 'r') as f:
                 content = f.read()
                 if "flask" in content.lower():
-                    return [sys.executable, file]
+                    return [sys.executable, file], installed
                 else:
-                    return [sys.executable, file]
+                    return [sys.executable, file], installed
     
     # Look for a Django project
     if os.path.exists("manage.py"):
         print("Found Django project")
-        return [sys.executable, "manage.py", "runserver", "0.0.0.0:8000"]
+        return [sys.executable, "manage.py", "runserver", "0.0.0.0:8000"], installed
     
     print("Could not determine how to start the Python application")
-    return None
+    return None, installed
 
 def setup_static_project(extract_dir):
-    """Set up a static web project."""
+    """Set up a static web project.
+
+    Returns ``(start_command, dependencies_installed)``; there is nothing to install.
+    """
     print("Setting up static web project...")
     
     # Change to the project directory
@@ -216,7 +377,7 @@ def setup_static_project(extract_dir):
     
     # Create a simple Python HTTP server
     print("Creating a simple HTTP server to serve static files...")
-    return [sys.executable, "-m", "http.server", "5000"]
+    return [sys.executable, "-m", "http.server", "5000"], True
 
 def run_application(start_command):
     """Run the application with the provided start command."""
@@ -231,36 +392,277 @@ def run_application(start_command):
     else:
         print("No start command determined. Please check the README.md for manual instructions.")
 
-def main():
+def build_dev_stack(project_type, project_dir, analyzer_path):
+    """Describe the processes to run under the supervisor for a project."""
+    import json
+    from dev_supervisor import ProcessSpec
+
+    project_dir = os.path.abspath(project_dir)
+    specs = []
+    if os.path.exists(analyzer_path):
+        # Node projects are analyzed once npm install has finished writing node_modules
+        specs.append(ProcessSpec(
+            "analyzer",
+            [sys.executable, analyzer_path, project_dir],
+            depends_on=("install",) if project_type == "nodejs" else (),
+            oneshot=True,
+            restart=False,
+            required=False,
+        ))
+
+    if project_type == "nodejs":
+        scripts = {}
+        try:
+            with open(os.path.join(project_dir, "package.json"), 'r') as f:
+                scripts = json.load(f).get("scripts", {})
+        except (OSError, json.JSONDecodeError):
+            print("Warning: Could not parse package.json")
+
+        specs.append(ProcessSpec(
+            "install",
+            ["npm", "install"],
+            cwd=project_dir,
+            oneshot=True,
+            restart=False,
+        ))
+        # The Multilingua server also serves the Vite frontend on port 5000
+        if "dev" in scripts:
+            specs.append(ProcessSpec(
+                "server",
+                ["npm", "run", "dev"],
+                cwd=project_dir,
+                env={"NODE_ENV": "development"},
+                depends_on=("install",),
+                ready_port=5000,
+                ready_timeout=180,
+            ))
+        else:
+            specs.append(ProcessSpec(
+                "server",
+                ["npm", "start"],
+                cwd=project_dir,
+                depends_on=("install",),
+                ready_port=5000,
+                ready_timeout=180,
+            ))
+        return specs
+
+    # Python and static projects are set up synchronously as before
+    cwd = os.getcwd()
+    if project_type == "python":
+        start_command, _ = setup_python_project(project_dir)
+    else:
+        start_command, _ = setup_static_project(project_dir)
+    os.chdir(cwd)
+    if start_command:
+        specs.append(ProcessSpec("server", start_command, cwd=project_dir))
+    return specs
+
+def archive_fingerprint(zip_path):
+    """Identify an archive by its location, size and modification time."""
+    st = os.stat(zip_path)
+    return f"{os.path.abspath(zip_path)}:{st.st_size}:{st.st_mtime_ns}"
+
+def manifest_hash(extract_dir, exclude=()):
+    """Hash the relative path, size and mtime of every extracted file.
+
+    Install and build output (MANIFEST_SKIP_DIRS) is left out, as are the
+    paths in *exclude*, so the hash only changes when the extracted sources do.
+    """
+    import hashlib
+    
+    exclude = {os.path.abspath(path) for path in exclude}
+    entries = []
+    for root, dirs, files in os.walk(extract_dir):
+        dirs[:] = [d for d in dirs if d not in MANIFEST_SKIP_DIRS]
+        for file in files:
+            path = os.path.join(root, file)
+            if os.path.abspath(path) in exclude:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append(f"{os.path.relpath(path, extract_dir)}\0{st.st_size}\0{st.st_mtime_ns}")
+    
+    digest = hashlib.sha256()
+    for entry in sorted(entries):
+        digest.update(entry.encode('utf-8', 'surrogateescape'))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+def dependency_hash(project_type, project_dir):
+    """Hash the dependency manifests, or return None if dependencies are not installed."""
+    import hashlib
+    
+    if project_type == "nodejs" and not os.path.isdir(os.path.join(project_dir, "node_modules")):
+        return None
+    if project_type == "python" and os.path.exists(os.path.join(project_dir, "requirements.txt")):
+        if not any(os.path.isdir(os.path.join(project_dir, d)) for d in ("venv", "env", ".venv", ".env")):
+            return None
+    
+    digest = hashlib.sha256(project_type.encode())
+    for name in DEPENDENCY_FILES:
+        path = os.path.join(project_dir, name)
+        if os.path.exists(path):
+            digest.update(name.encode())
+            digest.update(file_sha256(path).encode())
+    return digest.hexdigest()
+
+def report_path_for(project_dir):
+    """Return where analyze_project.py writes its report for *project_dir*."""
+    return os.path.join(os.path.dirname(project_dir), REPORT_FILE_NAME)
+
+def compute_fast_start_state(zip_path, extract_dir, project_type, project_dir, start_command):
+    """Describe the current installation so a later launch can detect changes."""
+    report_path = report_path_for(project_dir)
+    return {
+        "version": STATE_VERSION,
+        "zip_path": zip_path,
+        "archive": archive_fingerprint(zip_path),
+        "extract_dir": extract_dir,
+        "project_type": project_type,
+        "project_dir": project_dir,
+        "start_command": start_command,
+        "manifest": manifest_hash(extract_dir, exclude=(report_path,)),
+        "dependencies": dependency_hash(project_type, project_dir),
+        "report": file_sha256(report_path) if os.path.exists(report_path) else None,
+    }
+
+def save_fast_start_state(state_path, state):
+    import json
+    
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+def load_fast_start_state(state_path):
+    """Return the saved state if nothing changed since it was written, else None.
+
+    Only stats files and hashes small ones; the archive is not opened and
+    nothing is extracted, installed or analyzed.
+    """
+    import json
+    
+    try:
+        with open(state_path, 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    def stale(reason):
+        print(f"Fast start unavailable: {reason}")
+        return None
+    
+    try:
+        if state.get("version") != STATE_VERSION or not state.get("start_command"):
+            return stale("state file is incomplete")
+        zip_path = state["zip_path"]
+        project_dir = state["project_dir"]
+        if not os.path.exists(zip_path) or archive_fingerprint(zip_path) != state["archive"]:
+            return stale("the archive changed")
+        if not os.path.isdir(project_dir):
+            return stale("the project directory is missing")
+        report_path = report_path_for(project_dir)
+        if manifest_hash(state["extract_dir"], exclude=(report_path,)) != state["manifest"]:
+            return stale("the extracted files changed")
+        current_deps = dependency_hash(state["project_type"], project_dir)
+        if current_deps is None or current_deps != state["dependencies"]:
+            return stale("dependencies changed or are not installed")
+        if not state["report"] or not os.path.exists(report_path) or file_sha256(report_path) != state["report"]:
+            return stale("the analysis report is missing or changed")
+    except (KeyError, TypeError, OSError):
+        return stale("state file is invalid")
+    return state
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        # Skip importing argparse on the common no-argument launch
+        from types import SimpleNamespace
+        return SimpleNamespace(supervise=False, full_setup=False)
+    
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Unzip and run the Multilingua web application.")
+    parser.add_argument(
+        "--supervise",
+        action="store_true",
+        help="run install, analyzer and servers concurrently under the asyncio supervisor",
+    )
+    parser.add_argument(
+        "--full-setup",
+        action="store_true",
+        help="always extract, install and analyze, even if nothing changed since the last launch",
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main function to unzip and run the application."""
+    started = time.perf_counter()
+    args = parse_args(argv)
     print("=== Multilingua Web Application Setup ===")
     
+    state_path = os.path.abspath(STATE_FILE)
+    if not args.supervise and not args.full_setup:
+        state = load_fast_start_state(state_path)
+        if state:
+            elapsed = time.perf_counter() - started
+            print("Nothing changed since the last launch; skipping extraction, install and analysis.")
+            message = f"Fast start checks took {elapsed:.2f}s"
+            if state.get("setup_seconds"):
+                message += f", saving about {max(0.0, state['setup_seconds'] - elapsed):.1f}s of setup"
+            print(message)
+            os.chdir(state["project_dir"])
+            run_application(state["start_command"])
+            return
+    
     # Find the zip file
     zip_path = find_zip_file()
     if not zip_path:
         print(f"Error: Could not find the zip file '{ZIP_FILE_NAME}'")
         print("Please ensure the zip file is in the current directory or a subdirectory.")
         return
+    zip_path = os.path.abspath(zip_path)
     
     # Extract the zip file
     extract_dir = extract_zip(zip_path)
+    if not extract_dir:
+        print("Keeping the previous installation; please check the zip file.")
+        return
+    # The setup functions change directory, so keep absolute paths
+    extract_dir = os.path.abspath(extract_dir)
     
     # Detect project type
     project_type, project_dir = detect_project_type(extract_dir)
     
+    analyzer_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyze_project.py")
+    
+    if args.supervise:
+        from dev_supervisor import supervise
+        
+        specs = build_dev_stack(project_type, project_dir, analyzer_path)
+        if not any(spec.name == "server" for spec in specs):
+            print("Failed to determine how to start the application.")
+            print("Please check the README.md for manual instructions.")
+            return
+        sys.exit(supervise(specs))
+    
     # Setup and run the project based on its type
     start_command = None
+    dependencies_installed = False
     if project_type == "nodejs":
-        start_command = setup_nodejs_project(project_dir)
+        start_command, dependencies_installed = setup_nodejs_project(project_dir)
     elif project_type == "python":
-        start_command = setup_python_project(project_dir)
+        start_command, dependencies_installed = setup_python_project(project_dir)
     elif project_type == "static" or project_type == "unknown":
-        start_command = setup_static_project(project_dir)
+        start_command, dependencies_installed = setup_static_project(project_dir)
     
     # Run the application
     if start_command:
         # Run the analyze project script first to generate documentation
-        analyzer_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyze_project.py")
         if os.path.exists(analyzer_path):
             print("Analyzing project structure...")
             try:
@@ -271,6 +673,19 @@ def main():
             except Exception as e:
                 print(f"Warning: Failed to analyze project: {e}")
         
+        try:
+            if dependencies_installed:
+                state = compute_fast_start_state(zip_path, extract_dir, project_type, project_dir, start_command)
+                state["setup_seconds"] = round(time.perf_counter() - started, 3)
+                save_fast_start_state(state_path, state)
+            else:
+                # A partial install must not be reused; the next launch installs again
+                print("Dependency installation failed; fast start stays disabled until a setup succeeds.")
+                if os.path.exists(state_path):
+                    os.remove(state_path)
+        except OSError as e:
+            print(f"Warning: Could not save fast start state: {e}")
+        
         run_application(start_command)
     else:
         print("Failed to determine how to start the application.")